@@ -7,6 +7,8 @@ from typing import (
     Awaitable,
     Optional,
     TypeVar,
+    Any,
+    Dict,
 )
 
 # Import ParamSpec if supported
@@ -63,6 +65,19 @@ class RetryInfo:
             self.since
         )
 
+    def update_inplace(
+        self,
+        exception: Exception
+    ) -> 'RetryInfo':
+        """Update fails and exception of the current RetryInfo
+
+        It saves an allocation for each failure, but the object should not be held by user, see `retry(reuse_info=True)`
+        """
+
+        self.fails += 1
+        self.exception = exception
+        return self
+
 
 RetryPolicyStrategy = Tuple[bool, Union[int, float]]
 
@@ -85,11 +100,6 @@ RT = TypeVar('RT')
 TargetFunction = Callable[PS, Awaitable[RT]]
 
 
-async def await_coro(coro: BeforeRetryRT) -> None:
-    if inspect.isawaitable(coro):
-        await coro
-
-
 def warn(method_name: str, exception: Exception):
     warnings.warn(
         f"""[aioretry] {method_name} raises an exception:
@@ -103,44 +113,125 @@ It is usually a bug that you should fix!""",
 async def perform(
     fn: TargetFunction[PS, RT],
     retry_policy: RetryPolicy,
+    async_policy: bool,
     before_retry: Optional[BeforeRetry],
-    *args: PS.args,
-    **kwargs: PS.kwargs,
+    reuse_info: bool,
+    # Receive `args` and `kwargs` of `wrapped` as they are,
+    # so that they are not packed again for each call
+    args: Tuple[Any, ...],
+    kwargs: Dict[str, Any],
 ) -> RT:
-    info = None
+    # The first attempt is peeled off the loop,
+    # so that creating `info` needs no check for each retry.
+    # The failure is handled inside the `except` block,
+    # so that `sys.exc_info()` in `retry_policy` and `before_retry`
+    # still returns the exception of fn
+    try:
+        return await fn(*args, **kwargs)
+    # `CancelledError` is a subclass of `Exception` in Python 3.7,
+    # a cancelled task should never be retried
+    except asyncio.CancelledError:
+        raise
+    except Exception as fne:
+        info = RetryInfo(1, fne, time.monotonic())
 
+        try:
+            if async_policy:
+                abandon, delay = await retry_policy(info)  # type: ignore[misc]
+            else:
+                retry_policy_rt = retry_policy(info)
+
+                # A sync policy returns a tuple,
+                # which saves the awaitable check
+                if (
+                    type(retry_policy_rt) is not tuple
+                    and inspect.isawaitable(retry_policy_rt)
+                ):
+                    retry_policy_rt = await retry_policy_rt
+
+                abandon, delay = retry_policy_rt
+        except asyncio.CancelledError:
+            raise
+        except Exception as pe:
+            warn('retry_policy', pe)
+            raise
+
+        if abandon:
+            # Re-raise `fne` with its original traceback
+            raise
+
+        if before_retry is not None:
+            try:
+                before_retry_rt = before_retry(info)
+
+                # A sync `before_retry` usually returns None
+                if (
+                    before_retry_rt is not None
+                    and inspect.isawaitable(before_retry_rt)
+                ):
+                    await before_retry_rt
+            except asyncio.CancelledError:
+                raise
+            except Exception as be:
+                warn('before_retry', be)
+                raise
+
+        # `delay` could be 0, and then we retry immediately.
+        # `asyncio.sleep(0)` is skipped on purpose,
+        # which would reschedule the task onto the event loop for nothing
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    # The same as above, which is not shared by another coroutine
+    # to save a coroutine frame for each retry
     while True:
         try:
             return await fn(*args, **kwargs)
+        except asyncio.CancelledError:
+            raise
         except Exception as fne:
-            if info is None:
-                info = RetryInfo(1, fne, time.monotonic())
+            if reuse_info:
+                info.update_inplace(fne)
             else:
                 info = info.update(fne)
 
             try:
-                retry_policy_rt = retry_policy(info)
-
-                abandon, delay = (
-                    await retry_policy_rt
-                    if inspect.isawaitable(retry_policy_rt)
-                    else retry_policy_rt
-                )
+                if async_policy:
+                    abandon, delay = await retry_policy(info)  # type: ignore[misc]
+                else:
+                    retry_policy_rt = retry_policy(info)
+
+                    if (
+                        type(retry_policy_rt) is not tuple
+                        and inspect.isawaitable(retry_policy_rt)
+                    ):
+                        retry_policy_rt = await retry_policy_rt
+
+                    abandon, delay = retry_policy_rt
+            except asyncio.CancelledError:
+                raise
             except Exception as pe:
                 warn('retry_policy', pe)
-                raise pe
+                raise
 
             if abandon:
-                raise fne
+                raise
 
             if before_retry is not None:
                 try:
-                    await await_coro(before_retry(info))
+                    before_retry_rt = before_retry(info)
+
+                    if (
+                        before_retry_rt is not None
+                        and inspect.isawaitable(before_retry_rt)
+                    ):
+                        await before_retry_rt
+                except asyncio.CancelledError:
+                    raise
                 except Exception as be:
                     warn('before_retry', be)
-                    raise be
+                    raise
 
-            # `delay` could be 0
             if delay > 0:
                 await asyncio.sleep(delay)
 
@@ -150,8 +241,9 @@ def get_method(
     args: Tuple,
     name: str,
 ) -> T:
-    if not isinstance(target, str):
-        return target
+    # A plain pointer comparison, since a subclass of str is not expected
+    if type(target) is not str:
+        return target  # type: ignore[return-value]
 
     if len(args) == 0:
         raise RuntimeError(
@@ -166,12 +258,14 @@ def get_method(
 def retry(
     retry_policy: ParamRetryPolicy,
     before_retry: Optional[ParamBeforeRetry] = None,
+    reuse_info: bool = False,
 ) -> Callable[[TargetFunction[PS, RT]], TargetFunction[PS, RT]]:
     """Creates a decorator function
 
     Args:
         retry_policy (RetryPolicy, str): the retry policy
         before_retry (BeforeRetry, str, None): the function to be called after each failure of fn and before the corresponding retry.
+        reuse_info (bool): whether to update the same RetryInfo object for every failure instead of creating a new one. Defaults to False.
 
     Returns:
         A wrapped function which accepts the same arguments as fn and returns an Awaitable
@@ -182,19 +276,63 @@ def retry(
             ...
     """
 
+    # Whether the policy is an async function is only known beforehand
+    # if it is not a method name, otherwise the return value is checked
+    # for each retry
+    async_policy = (
+        not isinstance(retry_policy, str)
+        and inspect.iscoroutinefunction(retry_policy)
+    )
+
     def wrapper(fn: TargetFunction[PS, RT]) -> TargetFunction[PS, RT]:
-        async def wrapped(*args: PS.args, **kwargs: PS.kwargs) -> RT:
-            return await perform(
-                fn,
-                get_method(retry_policy, args, 'retry_policy'),
-                (
-                    get_method(before_retry, args, 'before_retry')
-                    if before_retry is not None
-                    else None
-                ),
-                *args,
-                **kwargs,
-            )
+        # The decorator arguments are fixed,
+        # so we decide the shape of `wrapped` only once,
+        # and only resolve method names for each call if necessary
+        if before_retry is None:
+            if isinstance(retry_policy, str):
+                async def wrapped(*args: PS.args, **kwargs: PS.kwargs) -> RT:
+                    return await perform(
+                        fn,
+                        get_method(retry_policy, args, 'retry_policy'),
+                        False,
+                        None,
+                        reuse_info,
+                        args,
+                        kwargs,
+                    )
+            else:
+                async def wrapped(*args: PS.args, **kwargs: PS.kwargs) -> RT:
+                    return await perform(
+                        fn,
+                        retry_policy,
+                        async_policy,
+                        None,
+                        reuse_info,
+                        args,
+                        kwargs,
+                    )
+        elif isinstance(retry_policy, str) or isinstance(before_retry, str):
+            async def wrapped(*args: PS.args, **kwargs: PS.kwargs) -> RT:
+                return await perform(
+                    fn,
+                    get_method(retry_policy, args, 'retry_policy'),
+                    async_policy,
+                    get_method(before_retry, args, 'before_retry'),
+                    reuse_info,
+                    args,
+                    kwargs,
+                )
+        else:
+            async def wrapped(*args: PS.args, **kwargs: PS.kwargs) -> RT:
+                return await perform(
+                    fn,
+                    retry_policy,
+                    async_policy,
+                    before_retry,
+                    reuse_info,
+                    args,
+                    kwargs,
+                )
 
         return wrapped
 
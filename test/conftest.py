@@ -0,0 +1,39 @@
+import asyncio
+import time
+
+import pytest
+
+
+# The real `asyncio.sleep`, before `fast_clock` patches it
+_sleep = asyncio.sleep
+
+
+class FastClock:
+    """A virtual clock which advances by exactly the delay of each sleep
+    without waiting for real time
+    """
+
+    def __init__(self):
+        self.now = 0.
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, delay):
+        self.now += delay
+
+        # Still yields to the event loop as `asyncio.sleep` does
+        await _sleep(0)
+
+
+@pytest.fixture
+def fast_clock(monkeypatch):
+    clock = FastClock()
+
+    monkeypatch.setattr(asyncio, 'sleep', clock.sleep)
+    # It also freezes the clock of the event loop, which is fine
+    # as long as the tests do not schedule timers with the real `asyncio.sleep`
+    monkeypatch.setattr(time, 'monotonic', clock.monotonic)
+
+    return clock
+
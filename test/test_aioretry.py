@@ -1,5 +1,10 @@
+import asyncio
+import re
+import sys
+import types
+from typing import Any, List
+
 import pytest
-from time import monotonic
 
 from aioretry import (
     retry
@@ -10,6 +15,10 @@ def retry_policy(info):
     return False, (info.fails - 1) * 0.1
 
 
+def no_wait_retry_policy(info):
+    return False, 0.
+
+
 async def async_retry_policy(info):
     return retry_policy(info)
 
@@ -19,15 +28,30 @@ class AwaitableRetryPolicy:
         self._info = info
 
     def __await__(self):
-        yield
+        # Returns without suspending the awaiting task,
+        # the unreachable `yield` only makes `__await__` a generator
         return retry_policy(self._info)
+        yield  # pragma: no cover
 
 
 def awaitable_retry_policy(info):
     return AwaitableRetryPolicy(info)
 
 
-@pytest.mark.asyncio
+class FailOnce:
+    def __init__(self, policy):
+        self._failed = False
+        self._policy = policy
+
+    @retry('_policy')
+    async def run(self):
+        if self._failed:
+            return 1
+
+        self._failed = True
+        raise RuntimeError('fail')
+
+
 async def test_simple():
     async def just_return():
         return 1
@@ -43,49 +67,39 @@ async def test_simple():
     retried = retry(awaitable_retry_policy)(just_return)
     assert await retried() == 1
 
-    class FailOnce:
-        def __init__(self, policy):
-            self._failed = False
-            self._policy = policy
+    # Each instance has its own state, so they could run concurrently
+    assert await asyncio.gather(
+        FailOnce(retry_policy).run(),
+        FailOnce(async_retry_policy).run(),
+        FailOnce(awaitable_retry_policy).run()
+    ) == [1, 1, 1]
 
-        @retry('_policy')
-        async def run(self):
-            if self._failed:
-                return 1
 
-            self._failed = True
-            raise RuntimeError('fail')
+# Decorated only once for the whole module
+@retry(retry_policy)
+async def run_success(n):
+    assert n == 1
+    return 1
 
-    assert await FailOnce(retry_policy).run() == 1
-    assert await FailOnce(async_retry_policy).run() == 1
-    assert await FailOnce(awaitable_retry_policy).run() == 1
 
+class SuccessInstance:
+    n = 1
 
-@pytest.mark.asyncio
-async def test_success():
     @retry(retry_policy)
-    async def run(n):
-        assert n == 1
-        return 1
+    async def run(self):
+        assert self.n == 1
+        return self.n
 
-    assert await run(1) == 1
 
+async def test_success():
+    assert await run_success(1) == 1
 
-@pytest.mark.asyncio
-async def test_success_instance_normal_rp():
-    class A:
-        n = 1
-
-        @retry(retry_policy)
-        async def run(self):
-            assert self.n == 1
-            return self.n
 
-    assert await A().run() == 1
+async def test_success_instance_normal_rp():
+    assert await SuccessInstance().run() == 1
 
 
-@pytest.mark.asyncio
-async def test_recursive():
+def _make_class(limit: int):
     class A:
         n = 0
 
@@ -96,15 +110,20 @@ async def test_recursive():
         async def run(self):
             self.n += 1
 
-            if self.n < 1000:
+            if self.n < limit:
                 raise RuntimeError('fail')
 
             return self.n
 
-    assert await A().run() == 1000
+    return A
+
+
+@pytest.mark.usefixtures('fast_clock')
+@pytest.mark.parametrize('n', [3, 1000])
+async def test_recursive(n):
+    assert await _make_class(n)().run() == n
 
 
-@pytest.mark.asyncio
 async def test_success_instance_str_rp():
     class A:
         n = 1
@@ -120,45 +139,44 @@ async def test_success_instance_str_rp():
     assert await A().run() == 1
 
 
-async def run_retry(async_after_failture: bool):
-    errors = []
+async def run_retry(async_after_failture: bool, clock):
+    fails = 4
+
+    # Preallocated by the number of expected failures
+    primative: List[Any] = [None] * fails
+    sinces = [0.] * fails
+    times = [0.] * fails
+    count = [0]
+
+    def record(info):
+        i = count[0]
+        # Project the info right away, so no post-processing is needed
+        primative[i] = (int(str(info.exception)), info.fails)
+        sinces[i] = info.since
+        times[i] = clock.monotonic()
+        count[0] = i + 1
 
     if async_after_failture:
         async def before_retry(info):
-            errors.append(
-                (
-                    info,
-                    monotonic()
-                )
-            )
+            record(info)
 
     else:
         def before_retry(info):
-            errors.append(
-                (
-                    info,
-                    monotonic()
-                )
-            )
+            record(info)
 
     @retry(retry_policy, before_retry)
     async def run():
-        length = len(errors)
+        length = count[0]
 
-        if length == 4:
+        if length == fails:
             return 1
 
         raise RuntimeError(f'{length}')
 
-    current = monotonic()
+    current = clock.monotonic()
 
     assert await run() == 1
 
-    primative = [
-        (int(str(info.exception)), info.fails)
-        for info, _ in errors
-    ]
-
     assert primative == [
         (0, 1),
         (1, 2),
@@ -166,36 +184,29 @@ async def run_retry(async_after_failture: bool):
         (3, 4)
     ]
 
-    since = None
-
-    for i, t in enumerate(errors):
-        info, time = t
-
-        if since is None:
-            since = info.since
-            assert current < since < current + 0.1
-        else:
-            assert since == info.since
+    # The fake clock only advances when `retry` sleeps
+    assert sinces[0] == pytest.approx(current)
+    assert sinces == [sinces[0]] * fails
 
+    for i, time in enumerate(times):
         delay = max(0, (i - 1) * 0.1)
         delta = time - current
 
-        assert delay < delta < delay + 0.1
+        assert delta == pytest.approx(delay)
 
         current = time
 
 
-@pytest.mark.asyncio
-async def test_error_normal_before_retry():
-    await run_retry(False)
+@pytest.mark.parametrize('async_before_retry', [False, True])
+async def test_error_before_retry(async_before_retry, fast_clock):
+    await run_retry(async_before_retry, fast_clock)
 
 
-@pytest.mark.asyncio
-async def test_error_async_before_retry():
-    await run_retry(True)
+USAGE_ERROR = re.compile(
+    re.escape('retry_policy as a str "_retry_policy"')
+)
 
 
-@pytest.mark.asyncio
 async def test_error_usage():
     @retry('_retry_policy')
     async def run():
@@ -203,12 +214,11 @@ async def test_error_usage():
 
     with pytest.raises(
         RuntimeError,
-        match='retry_policy as a str "_retry_policy"'
+        match=USAGE_ERROR
     ):
         await run()
 
 
-@pytest.mark.asyncio
 async def test_before_retry_fails():
     fail = True
 
@@ -216,24 +226,31 @@ async def test_before_retry_fails():
         if fail:
             raise RuntimeError('boom')
 
-    @retry(retry_policy, before_retry)
+    @retry(no_wait_retry_policy, before_retry)
     async def run():
         if fail:
             raise RuntimeError('haha')
 
     with pytest.warns(UserWarning, match='fix'):
         with pytest.raises(RuntimeError, match='boom'):
-            await run()
+            # Fails fast if it ever starts to wait
+            await asyncio.wait_for(run(), 1.)
 
 
-@pytest.mark.asyncio
-async def test_abandon():
+@pytest.mark.usefixtures('fast_clock')
+@pytest.mark.parametrize('with_before_retry', [False, True])
+async def test_abandon(with_before_retry):
     def retry_policy(info):
         return info.fails > 3, info.fails * 0.1
 
+    fails = []
+
+    def before_retry(info):
+        fails.append(info.fails)
+
     fail = True
 
-    @retry(retry_policy)
+    @retry(retry_policy, before_retry if with_before_retry else None)
     async def run():
         if fail:
             raise RuntimeError('boom')
@@ -241,33 +258,38 @@ async def test_abandon():
     with pytest.raises(RuntimeError, match='boom'):
         await run()
 
+    # `before_retry` is not called once the retry is abandoned
+    assert fails == ([1, 2, 3] if with_before_retry else [])
 
-@pytest.mark.asyncio
-async def test_retry_policy_on_exceptions():
-    def retry_policy(info):
-        if isinstance(info.exception, KeyError):
-            return True, 0
 
-        return False, 0.1
+def key_error_retry_policy(info):
+    if isinstance(info.exception, KeyError):
+        return True, 0
 
-    class A:
-        def __init__(self):
-            self._failed = False
+    return False, 0.1
 
-        @retry(
-            retry_policy=retry_policy
-        )
-        async def run(self, value_error: bool = False):
-            if value_error:
-                if self._failed:
-                    return 1
 
-                self._failed = True
-                raise ValueError('value error')
+class RetryOnValueError:
+    def __init__(self):
+        self._failed = False
 
-            raise KeyError('key error')
+    @retry(
+        retry_policy=key_error_retry_policy
+    )
+    async def run(self, value_error: bool = False):
+        if value_error:
+            if self._failed:
+                return 1
 
-    a = A()
+            self._failed = True
+            raise ValueError('value error')
+
+        raise KeyError('key error')
+
+
+@pytest.mark.usefixtures('fast_clock')
+async def test_retry_policy_on_exceptions():
+    a = RetryOnValueError()
 
     assert await a.run(True) == 1
 
@@ -275,15 +297,196 @@ async def test_retry_policy_on_exceptions():
         await a.run()
 
 
-@pytest.mark.asyncio
-async def test_retry_policy_raises():
+@pytest.mark.parametrize('before_retry', [None, lambda info: None])
+async def test_retry_policy_raises(before_retry):
     def retry_policy():
         return False, 0
 
-    @retry(retry_policy)
+    @retry(retry_policy, before_retry)
     async def run():
         raise RuntimeError('boom')
 
     with pytest.warns(UserWarning, match='fix'):
         with pytest.raises(TypeError, match='but 1 was given'):
             await run()
+
+
+@pytest.mark.usefixtures('fast_clock')
+async def test_before_retry_awaitables():
+    events = []
+
+    @types.coroutine
+    def generator_based(info):
+        yield
+        events.append(info.fails)
+
+    def future_based(info):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def resolve():
+            events.append(info.fails)
+            future.set_result(None)
+
+        loop.call_soon(resolve)
+        return future
+
+    for before_retry in (generator_based, future_based):
+        events.clear()
+
+        @retry(retry_policy, before_retry)
+        async def run():
+            events.append('run')
+
+            if len(events) < 5:
+                raise RuntimeError('fail')
+
+            return 1
+
+        assert await run() == 1
+        assert events == ['run', 1, 'run', 2, 'run']
+
+
+@pytest.mark.usefixtures('fast_clock')
+async def test_str_before_retry():
+    class A:
+        def __init__(self):
+            self.fails = []
+
+        def _before_retry(self, info):
+            self.fails.append(info.fails)
+
+        @retry(retry_policy, '_before_retry')
+        async def run(self):
+            if len(self.fails) < 2:
+                raise RuntimeError('fail')
+
+            return 1
+
+    a = A()
+
+    assert await a.run() == 1
+    assert a.fails == [1, 2]
+
+
+@pytest.mark.usefixtures('fast_clock')
+@pytest.mark.parametrize('reuse_info', [False, True])
+@pytest.mark.parametrize('with_before_retry', [False, True])
+async def test_reuse_info(reuse_info, with_before_retry):
+    infos = []
+
+    # Collected by the policy, which is called with or without `before_retry`
+    def collect_retry_policy(info):
+        infos.append(info)
+        return retry_policy(info)
+
+    def before_retry(info):
+        assert info is infos[-1]
+
+    @retry(
+        collect_retry_policy,
+        before_retry if with_before_retry else None,
+        reuse_info=reuse_info
+    )
+    async def run():
+        if len(infos) < 3:
+            raise RuntimeError(f'{len(infos)}')
+
+        return 1
+
+    assert await run() == 1
+    assert len(infos) == 3
+
+    if reuse_info:
+        assert infos[0] is infos[1] is infos[2]
+        assert infos[0].fails == 3
+        assert str(infos[0].exception) == '2'
+    else:
+        assert [info.fails for info in infos] == [1, 2, 3]
+        assert len({info.since for info in infos}) == 1
+
+
+async def test_cancelled():
+    infos = []
+
+    def retry_policy(info):
+        infos.append(info)
+        return False, 0
+
+    started = asyncio.Event()
+
+    @retry(retry_policy)
+    async def run():
+        started.set()
+        await asyncio.sleep(10)
+
+    task = asyncio.ensure_future(run())
+    await started.wait()
+    task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert infos == []
+
+
+@pytest.mark.usefixtures('fast_clock')
+@pytest.mark.parametrize('policy', [
+    async_retry_policy,
+    awaitable_retry_policy
+])
+@pytest.mark.parametrize('with_before_retry', [False, True])
+async def test_async_retry_policy(policy, with_before_retry):
+    fails = []
+    before_retry_fails = []
+
+    def before_retry(info):
+        before_retry_fails.append(info.fails)
+
+    @retry(policy, before_retry if with_before_retry else None)
+    async def run():
+        if len(fails) < 2:
+            fails.append(1)
+            raise RuntimeError('fail')
+
+        return 1
+
+    assert await run() == 1
+    assert len(fails) == 2
+    assert before_retry_fails == ([1, 2] if with_before_retry else [])
+
+
+@pytest.mark.usefixtures('fast_clock')
+async def test_hooks_see_fn_exception():
+    handled = []
+
+    def retry_policy(info):
+        handled.append(sys.exc_info()[1] is info.exception)
+        return info.fails > 2, 0.1
+
+    def before_retry(info):
+        handled.append(sys.exc_info()[1] is info.exception)
+
+    @retry(retry_policy, before_retry)
+    async def run():
+        raise ValueError('fn')
+
+    with pytest.raises(ValueError, match='fn'):
+        await run()
+
+    assert handled == [True] * 5
+
+
+async def test_hook_exception_context():
+    def before_retry(info):
+        raise RuntimeError('boom')
+
+    @retry(no_wait_retry_policy, before_retry)
+    async def run():
+        raise ValueError('fn')
+
+    with pytest.warns(UserWarning, match='fix'):
+        with pytest.raises(RuntimeError, match='boom') as exc_info:
+            await run()
+
+    assert isinstance(exc_info.value.__context__, ValueError)